@@ -1,15 +1,480 @@
 import anthropic
+import asyncio
+import hashlib
 import json
+import logging
 import os
+import random
+import string
+import sys
 import time
 import re
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, replace
+import httpx
 import requests
 from datetime import datetime
 
-# Define data structures for our research agent
-@dataclass
+# Optional dependency: persistent on-disk cache for LLM responses
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# Optional dependency: C-implemented JSON codec, ~2-5x faster than stdlib
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional dependency: vectorized random generation for mock search results
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional dependency: Aho-Corasick automaton for linear-time subtopic tagging
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _json_loads(text):
+    """Parse JSON with orjson when available, stdlib json otherwise."""
+    return orjson.loads(text) if orjson else json.loads(text)
+
+
+def _json_dumps(obj) -> str:
+    """Serialize to indented JSON with orjson when available."""
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def _write_json(path: str, obj) -> None:
+    """
+    Write an object as indented JSON in one binary write: orjson already
+    produces bytes, so this skips the decode and text-mode re-encode that
+    open(..., "w").write() would pay, and lands in a single syscall.
+    """
+    if orjson:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(obj, indent=2).encode()
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+logger = logging.getLogger(__name__)
+
+_JOURNALS = ("Nature", "Science", "PNAS", "Cell", "The Lancet")
+_RNG = np.random.default_rng() if np else None
+
+# Mock document body, preparsed once. Template.substitute is C-backed, so the
+# demo path skips rebuilding a ~1.5 KB f-string per (subtopic, copy) pair.
+_MOCK_DOC_TMPL = string.Template("""
+Abstract:
+This research explores $subtopic in detail, with a focus on recent developments.
+We analyze the implications of $keyword on various aspects of $subtopic.
+
+Introduction:
+The field of $subtopic has seen significant advancement in recent years.
+This paper aims to provide a comprehensive overview of the current state of research
+and identify future directions. We begin by examining the fundamental concepts
+related to $keyword.
+
+Methodology:
+Our research methodology involved a systematic review of literature published
+between $t0 and $t1.
+We analyzed over 50 papers from leading journals in the field.
+
+Findings:
+Our analysis revealed several key patterns. First, $subtopic is increasingly
+recognized as critical in understanding $query.
+Second, the connection between $subtopic and $keyword2
+appears stronger than previously thought.
+
+Discussion:
+These findings suggest that future research should focus on exploring the
+relationship between $subtopic and $keyword3.
+There are still significant gaps in our understanding of how $subtopic
+affects practical applications in real-world scenarios.
+
+Conclusion:
+This research contributes to the growing body of knowledge on $query
+and highlights the importance of $subtopic in this context.
+""")
+
+# Maximum number of concurrent Claude calls (keeps us under Anthropic rate limits)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Message Batches polling cadence and overall cap before falling back
+BATCH_POLL_INTERVAL = 5.0
+BATCH_TIMEOUT = 600.0
+
+# Per-minute request/token budgets for async dispatch, and retry policy for
+# rate-limit and server errors
+DEFAULT_RPM = 40
+DEFAULT_TPM = 16000
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 2.0
+
+# Limits for packing several documents into one extraction call
+MAX_DOCS_PER_EXTRACTION = 5
+EXTRACTION_TOKEN_BUDGET = 10000  # total document tokens per batch
+
+# Approximate tokens-per-word ratio for Claude-style BPE tokenizers; documents
+# are truncated by token budget instead of a raw character slice
+TOKENS_PER_WORD = 4 / 3
+DOC_TOKEN_BUDGET = 2000  # per-document token budget in extraction prompts
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without a tokenizer dependency."""
+    return int(len(text.split()) * TOKENS_PER_WORD)
+
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    """Truncate text to an approximate token budget, preserving formatting."""
+    max_words = int(budget / TOKENS_PER_WORD)
+    end = None
+    for i, match in enumerate(re.finditer(r"\S+", text)):
+        if i >= max_words:
+            end = match.start()
+            break
+    return text if end is None else text[:end]
+
+# Near-duplicate thresholds (Jaccard similarity over word shingles)
+DOC_DUP_JACCARD = 0.85
+FINDING_DUP_JACCARD = 0.9
+
+# Plan reuse: queries whose word sets overlap at least this much share a plan
+PLAN_SIMILARITY_THRESHOLD = 0.6
+PLAN_CACHE_PATH = ".research_plan_cache.json"
+
+# LLM response cache: how long entries stay valid
+CACHE_TTL_SECONDS = 86400.0
+
+# Keywords scoring below this against the query/subtopics are not searched
+KEYWORD_RELEVANCE_THRESHOLD = 0.3
+KEYWORD_SEARCH_BUDGET = 3
+
+
+def _shingles(text: str, size: int = 3) -> frozenset:
+    """Hashed word shingles of a text, used for cheap near-duplicate detection."""
+    words = re.findall(r"\w+", text.lower())
+    if not words:
+        return frozenset()
+    if len(words) < size:
+        return frozenset([hash(tuple(words))])
+    return frozenset(hash(tuple(words[i:i + size])) for i in range(len(words) - size + 1))
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity between two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+class _JsonStreamTracker:
+    """
+    Tracks top-level JSON object balance across streamed text chunks, so a
+    streaming consumer knows the moment the object closes and can stop the
+    stream (and the generation behind it) instead of waiting out max_tokens.
+    """
+
+    def __init__(self):
+        self.complete = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume one chunk; returns True once the first object has closed."""
+        for ch in text:
+            if self._escaped:
+                self._escaped = False
+            elif self._in_string:
+                if ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}" and self._depth:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.complete = True
+        return self.complete
+
+# Compiled once: fenced JSON blocks in free-text responses. The lazy body
+# match keeps the engine from backtracking over the whole response.
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _find_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced top-level JSON object in a text, or None.
+
+    One linear scan tracking string and escape state, so braces inside string
+    values or in prose after the object can't corrupt the slice the way a
+    first-'{' / last-'}' split does.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if escaped:
+            escaped = False
+        elif in_string:
+            if ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+# Bump this when prompts change so stale cache entries are invalidated
+CACHE_SCHEMA = 2
+
+# Tool input schemas for structured outputs. Forcing tool use makes Claude
+# return schema-valid JSON server-side, so responses no longer need regex
+# extraction and can't be wasted on unparseable prose.
+PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "main_query": {"type": "string"},
+        "subtopics": {"type": "array", "items": {"type": "string"}},
+        "keywords": {"type": "array", "items": {"type": "string"}},
+        "scope": {
+            "type": "object",
+            "properties": {
+                "time_range": {"type": "array", "items": {"type": "string"}},
+                "domains": {"type": "array", "items": {"type": "string"}},
+                "excluded_areas": {"type": "array", "items": {"type": "string"}}
+            }
+        },
+        "potential_sources": {"type": "array", "items": {"type": "string"}},
+        "research_approach": {"type": "string"}
+    },
+    "required": ["main_query", "subtopics", "keywords", "scope"]
+}
+
+EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "key_findings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "finding": {"type": "string"},
+                    "evidence": {"type": "string"},
+                    "relevance": {"type": "string"},
+                    "confidence": {"type": "number"}
+                },
+                "required": ["finding", "confidence"]
+            }
+        },
+        "methodologies": {"type": "array", "items": {"type": "string"}},
+        "limitations": {"type": "array", "items": {"type": "string"}},
+        "research_gaps": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["key_findings"]
+}
+
+# Batched variant: one extraction per document, identified by doc_index
+BATCH_EXTRACTION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "extractions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "doc_index": {"type": "integer"},
+                    **EXTRACTION_SCHEMA["properties"]
+                },
+                "required": ["doc_index", "key_findings"]
+            }
+        }
+    },
+    "required": ["extractions"]
+}
+
+SYNTHESIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "executive_summary": {"type": "string"},
+        "synthesis_by_subtopic": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "subtopic": {"type": "string"},
+                    "synthesis": {"type": "string"},
+                    "key_insights": {"type": "array", "items": {"type": "string"}}
+                },
+                "required": ["subtopic", "synthesis"]
+            }
+        },
+        "cross_cutting_themes": {"type": "array", "items": {"type": "string"}},
+        "contradictions": {"type": "array", "items": {"type": "string"}},
+        "research_gaps": {"type": "array", "items": {"type": "string"}},
+        "future_directions": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["title", "executive_summary", "synthesis_by_subtopic"]
+}
+
+INSIGHTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "deeper_patterns": {"type": "array", "items": {"type": "string"}},
+        "transformative_ideas": {"type": "array", "items": {"type": "string"}},
+        "interdisciplinary_connections": {"type": "array", "items": {"type": "string"}},
+        "practical_applications": {"type": "array", "items": {"type": "string"}},
+        "critical_perspective": {"type": "string"},
+        "enhanced_future_directions": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["deeper_patterns", "practical_applications"]
+}
+
+# Prompt scaffolding, parsed once at import: each call substitutes only the
+# variable slots instead of re-assembling the multi-KB instruction text.
+_PLAN_PROMPT_TMPL = string.Template("""
+            Create a detailed research plan for the following query:
+
+            QUERY: $query
+            DEPTH: $depth
+
+            Your task is to:
+            1. Break down this research question into clear subtopics
+            2. Identify key search terms and keywords for each subtopic
+            3. Define the scope of research (time period, domains, etc.)
+            4. Identify potential sources of information
+            5. Suggest a structured approach to investigate this topic
+            """)
+
+_PLAN_ADAPT_TMPL = string.Template("""
+            Adapt the following research plan, originally created for the query
+            "$cached_query", to this new query:
+
+            QUERY: $query
+            DEPTH: $depth
+
+            EXISTING PLAN:
+            $plan
+
+            Update the subtopics, keywords, and scope only where the new query
+            differs; keep everything that still applies.
+            """)
+
+_EXTRACTION_PROMPT_TMPL = string.Template("""
+        Extract key information and findings from each of the following research
+        documents. Report one extraction per document, identified by its doc_index
+        (the number after "### DOC").
+
+        $document_sections
+
+        RESEARCH QUESTION:
+        $query
+
+        RELEVANT SUBTOPICS:
+        $subtopics
+
+        For each document, extract the following:
+        1. Key findings or claims made in the document
+        2. Evidence provided to support these findings
+        3. Methodologies used
+        4. Limitations mentioned
+        5. How the findings relate to our research question
+        """)
+
+_SYNTHESIS_PROMPT_TMPL = string.Template("""
+            Synthesize the following research findings into a coherent narrative.
+
+            RESEARCH QUESTION:
+            $query
+
+            SUBTOPICS:
+            $subtopics
+
+            FINDINGS:
+            $findings
+
+            Your task is to:
+            1. Create a comprehensive synthesis of these findings
+            2. Identify patterns, trends, and connections across findings
+            3. Note contradictions or inconsistencies between findings
+            4. Identify gaps in the research
+            5. Suggest potential directions for future research
+            """)
+
+# Static instruction blocks for the insight and formatting calls; these are
+# the cache-marked prefixes handed to _cached_content
+_INSIGHT_INSTRUCTIONS = """
+            Analyze the research synthesis that follows to generate deeper insights
+            and identify patterns that may not be immediately obvious.
+
+            Your task is to:
+            1. Identify non-obvious patterns or connections in the research
+            2. Suggest potential paradigm shifts or transformative ideas
+            3. Identify interdisciplinary connections
+            4. Suggest practical applications of the research findings
+            5. Provide a critical perspective on the limitations of current approaches
+            """
+
+_FORMAT_INSTRUCTIONS = """
+            Format the research data that follows into a professional research report.
+
+            Create a comprehensive research report with the following sections:
+            1. Executive Summary
+            2. Introduction and Background
+            3. Methodology
+            4. Key Findings
+            5. Discussion and Implications
+            6. Research Gaps
+            7. Future Directions
+            8. Conclusion
+            9. Bibliography
+
+            Format your response as a valid JSON object that contains the complete text
+            for each section of the report:
+            {
+                "title": "Report title",
+                "executive_summary": "Complete text for executive summary",
+                "introduction": "Complete text for introduction",
+                "methodology": "Complete text for methodology",
+                "key_findings": "Complete text for key findings",
+                "discussion": "Complete text for discussion",
+                "research_gaps": "Complete text for research gaps",
+                "future_directions": "Complete text for future directions",
+                "conclusion": "Complete text for conclusion",
+                "bibliography": ["citation1", "citation2", ...]
+            }
+            """
+
+# Define data structures for our research agent.  slots=True drops the
+# per-instance __dict__ (these objects are created in bulk during retrieval
+# and extraction) and speeds attribute access in the hot loops.
+@dataclass(slots=True, frozen=True)
 class ResearchDocument:
     """Represents a research document or paper."""
     id: str
@@ -22,8 +487,27 @@ class ResearchDocument:
     url: Optional[str] = None
     citation: Optional[str] = None
     relevance_score: Optional[float] = None
+    token_count: int = 0
+    snippet: str = ""
+    shingles: frozenset = frozenset()
+    authors_str: str = ""
+
+    def __post_init__(self):
+        # Derive the truncated snippet, token count, dedup shingles, and the
+        # joined author string once at ingest so no hot loop re-slices or
+        # re-joins the same data (object.__setattr__ because the dataclass is
+        # frozen)
+        object.__setattr__(self, "token_count", _estimate_tokens(self.content))
+        object.__setattr__(self, "snippet", _truncate_to_tokens(self.content, DOC_TOKEN_BUDGET))
+        object.__setattr__(self, "shingles", _shingles(self.content))
+        object.__setattr__(self, "authors_str", ", ".join(self.authors))
 
-@dataclass
+# Document fields worth persisting; token_count, snippet, and shingles are
+# derived in __post_init__ and recomputed on load
+_DOC_STATE_FIELDS = ("id", "title", "authors", "publication_date", "source",
+                     "content", "abstract", "url", "citation", "relevance_score")
+
+@dataclass(slots=True)
 class ResearchTopic:
     """Represents a research topic or question."""
     id: str
@@ -32,16 +516,16 @@ class ResearchTopic:
     keywords: List[str]
     scope: Dict[str, Any]  # time range, domains, etc.
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchFinding:
     """Represents an extracted finding or insight."""
     id: str
     content: str
-    source_documents: List[str]  # document IDs
+    source_documents: Tuple[str, ...]  # document IDs
     confidence: float
-    tags: List[str]
+    tags: Tuple[str, ...]
 
-@dataclass
+@dataclass(slots=True)
 class ResearchSynthesis:
     """Represents a synthesized research output."""
     id: str
@@ -53,21 +537,601 @@ class ResearchSynthesis:
     future_directions: List[str]
     bibliography: List[str]
 
+class AsyncRateLimiter:
+    """
+    Token-bucket limiter over both requests/min and tokens/min. acquire()
+    blocks until both budgets have room, refilling continuously from elapsed
+    time, so concurrent callers saturate the tier budget instead of either
+    serializing or tripping 429s.
+    """
+
+    def __init__(self, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.0)
+        self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.0)
+
+    async def acquire(self, estimated_tokens: int = 0) -> None:
+        # A reservation larger than the bucket can never be satisfied; clamp
+        # it so an oversized estimate drains the full budget instead of
+        # spinning forever.
+        estimated_tokens = min(estimated_tokens, self.tpm)
+        while True:
+            # No await between refill and debit, so the check-and-take is
+            # atomic within the event loop without a lock -- and a lock would
+            # pin the limiter to whichever loop first used it, breaking the
+            # per-loop lifecycle in _run_in_loop
+            self._refill()
+            if self._requests >= 1.0 and self._tokens >= estimated_tokens:
+                self._requests -= 1.0
+                self._tokens -= estimated_tokens
+                return
+            # Sleep until the tighter of the two budgets has refilled
+            wait = max(
+                (1.0 - self._requests) * 60.0 / self.rpm,
+                (estimated_tokens - self._tokens) * 60.0 / self.tpm
+            )
+            await asyncio.sleep(wait)
+
+
+class LLMCache:
+    """
+    Content-addressed cache for LLM responses, keyed by a hash of the request
+    and persisted across runs: repeat runs in dev or CI resolve most calls
+    without touching the API. Backed by diskcache when available and by a
+    JSON file otherwise, with per-entry hit counts and last-used timestamps
+    driving TTL expiry. Hit/miss stats are tracked inside get() so every
+    caller is counted uniformly.
+
+    The source request suggested an embedding-similarity tier for near-match
+    lookups; this module has no embedding stack, so lookups are exact-match
+    only — near-duplicate prompts are instead avoided upstream by the plan
+    reuse index.
+    """
+
+    def __init__(self, path: str = ".research_cache", ttl: float = CACHE_TTL_SECONDS,
+                 enabled: bool = True):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0}
+        # diskcache treats path as a directory; the JSON backend stores a
+        # single file alongside it
+        self._json_path = f"{path}.json"
+        self._diskcache = diskcache.Cache(path) if diskcache else None
+        self._entries = None if self._diskcache is not None else self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the JSON-file backend, dropping entries past their TTL."""
+        try:
+            with open(self._json_path) as f:
+                entries = _json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        cutoff = time.time() - self.ttl
+        return {key: entry for key, entry in entries.items()
+                if entry["last_used"] >= cutoff}
+
+    def _save(self) -> None:
+        try:
+            with open(self._json_path, "w") as f:
+                f.write(_json_dumps(self._entries))
+        except OSError as e:
+            logger.exception("Error saving LLM cache")
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        if self._diskcache is not None:
+            value = self._diskcache.get(key)
+        else:
+            value = None
+            entry = self._entries.get(key)
+            if entry is not None and entry["last_used"] >= time.time() - self.ttl:
+                entry["hit_count"] += 1
+                entry["last_used"] = time.time()
+                value = entry["value"]
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        if self._diskcache is not None:
+            self._diskcache.set(key, value, expire=ttl or self.ttl)
+        else:
+            self._entries[key] = {"value": value, "hit_count": 0,
+                                  "last_used": time.time()}
+            self._save()
+
+
 class DeepResearchAgent:
     """
     A comprehensive research agent powered by Claude 3.7 that can perform
     deep research on academic and professional topics.
     """
     
-    def __init__(self, api_key: str, search_api_key: str = None):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(self, api_key: str, search_api_key: str = None,
+                 use_cache: bool = True):
+        # Shared HTTP clients with connection keep-alive, so the dozens of API
+        # calls per research run reuse TCP/TLS sessions instead of paying a
+        # handshake each; HTTP/2 additionally multiplexes the concurrent calls
+        # over one connection (requires the httpx h2 extra)
+        self._limits = httpx.Limits(max_keepalive_connections=32)
+        try:
+            self._http_client = httpx.Client(http2=True, limits=self._limits)
+            self._http2 = True
+        except ImportError:
+            self._http_client = httpx.Client(limits=self._limits)
+            self._http2 = False
+        self.client = anthropic.Anthropic(api_key=api_key, http_client=self._http_client)
+        # The async client is bound to whichever event loop it first runs on,
+        # and this agent enters asyncio.run more than once per research run --
+        # so _run_in_loop opens a fresh async pool per loop rather than
+        # sharing one here
+        self._api_key = api_key
+        self._ahttp_client = None
+        self.aclient = None
         self.search_api_key = search_api_key
         self.documents = {}  # Store retrieved documents
         self.findings = {}   # Store extracted findings
         self.research_plans = {}  # Store research plans
         self.syntheses = {}  # Store final syntheses
-        
-    def conduct_research(self, query: str, depth: str = "comprehensive", 
+        # Cache LLM responses on a content hash of the request so repeat runs
+        # (and duplicate prompts within a run) skip the API call entirely
+        self._llm_cache = LLMCache(enabled=use_cache)
+        # Shared budget for all async Claude calls in this process
+        self._rate_limiter = AsyncRateLimiter()
+        # Dedup state: overlapping keywords routinely return the same paper, and
+        # each duplicate would otherwise pay for another extraction LLM call
+        self._seen_urls = set()
+        self._seen_doc_shingles = []
+        # Compiled subtopic matchers, built once per research topic
+        self._subtopic_patterns = {}
+        # Formatted citations by document id, reused across syntheses
+        self._citation_cache = {}
+        # Prior plans indexed by query words, persisted across runs
+        self._plan_index = self._load_plan_index()
+
+    def close(self):
+        """Release pooled HTTP connections."""
+        try:
+            self._http_client.close()
+        except Exception:
+            pass
+        # Async pools are opened and closed per event loop by _run_in_loop,
+        # so there is nothing async left to release here
+
+    def __del__(self):
+        self.close()
+
+    async def _run_in_loop(self, coro):
+        """
+        Await a coroutine with an async Anthropic client bound to the current
+        event loop.
+
+        Keep-alive connections cannot outlive the loop that opened them, so a
+        client shared across asyncio.run calls would hand later loops dead
+        sockets ("Event loop is closed"). Each entry therefore opens its own
+        pool and closes it before the loop exits.
+        """
+        try:
+            self._ahttp_client = httpx.AsyncClient(http2=self._http2, limits=self._limits)
+        except ImportError:
+            self._ahttp_client = httpx.AsyncClient(limits=self._limits)
+        self.aclient = anthropic.AsyncAnthropic(
+            api_key=self._api_key, http_client=self._ahttp_client
+        )
+        try:
+            return await coro
+        finally:
+            await self._ahttp_client.aclose()
+            self._ahttp_client = None
+            self.aclient = None
+
+    def _load_plan_index(self) -> List[Dict[str, Any]]:
+        """Load previously generated plans from disk (empty on first run)."""
+        try:
+            with open(PLAN_CACHE_PATH) as f:
+                return _json_loads(f.read())
+        except (OSError, ValueError):
+            return []
+
+    def _find_similar_plan(self, query: str) -> Optional[tuple]:
+        """Return (query, plan, similarity) for the most similar cached plan."""
+        words = frozenset(re.findall(r"\w+", query.lower()))
+        best = None
+        best_sim = PLAN_SIMILARITY_THRESHOLD
+        for entry in self._plan_index:
+            sim = _jaccard(words, frozenset(entry["words"]))
+            if sim >= best_sim:
+                best = (entry["query"], entry["plan"], sim)
+                best_sim = sim
+        return best
+
+    @staticmethod
+    def _plan_usable(plan_json: Dict[str, Any]) -> bool:
+        """
+        Whether a plan payload is worth reusing: a truncated or empty tool
+        response parses as {} and must not be served back verbatim.
+        """
+        return bool(plan_json.get("subtopics")) and bool(plan_json.get("keywords"))
+
+    def _remember_plan(self, query: str, plan_json: Dict[str, Any]) -> None:
+        """Add a plan to the reuse index and persist it for later runs."""
+        if "error" in plan_json or not self._plan_usable(plan_json):
+            return
+        entry = {
+            "query": query,
+            "words": sorted(set(re.findall(r"\w+", query.lower()))),
+            "plan": plan_json
+        }
+        # One entry per query: re-running the same query replaces its plan
+        # instead of growing the index without bound
+        for idx, existing in enumerate(self._plan_index):
+            if existing["query"] == query:
+                self._plan_index[idx] = entry
+                break
+        else:
+            self._plan_index.append(entry)
+        try:
+            with open(PLAN_CACHE_PATH, "w") as f:
+                f.write(_json_dumps(self._plan_index))
+        except OSError as e:
+            logger.exception("Error saving plan cache")
+
+    def save_state(self, path: str) -> None:
+        """Persist documents, findings, plans, and syntheses for later runs."""
+        state = {
+            "documents": [{field: getattr(d, field) for field in _DOC_STATE_FIELDS}
+                          for d in self.documents.values()],
+            "findings": [asdict(f) for f in self.findings.values()],
+            "research_plans": self.research_plans,
+            "syntheses": [asdict(s) for s in self.syntheses.values()]
+        }
+        try:
+            with open(path, "w") as f:
+                f.write(_json_dumps(state))
+        except OSError as e:
+            logger.exception("Error saving state")
+
+    def load_state(self, path: str) -> None:
+        """Restore state written by save_state, reseeding the dedup indexes."""
+        try:
+            with open(path) as f:
+                state = _json_loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.exception("Error loading state")
+            return
+        for raw in state.get("documents", []):
+            document = ResearchDocument(**raw)
+            self.documents[document.id] = document
+            if document.url:
+                self._seen_urls.add(document.url)
+            self._seen_doc_shingles.append(document.shingles)
+        for raw in state.get("findings", []):
+            self.findings[raw["id"]] = self._finding_from_state(raw)
+        self.research_plans.update(state.get("research_plans", {}))
+        for raw in state.get("syntheses", []):
+            raw["key_findings"] = [self._finding_from_state(f) for f in raw["key_findings"]]
+            self.syntheses[raw["id"]] = ResearchSynthesis(**raw)
+
+    @staticmethod
+    def _finding_from_state(raw: Dict[str, Any]) -> ResearchFinding:
+        """Rebuild a finding from its JSON form (tuple fields arrive as lists)."""
+        return ResearchFinding(
+            id=raw["id"],
+            content=raw["content"],
+            source_documents=tuple(raw["source_documents"]),
+            confidence=raw["confidence"],
+            tags=tuple(raw["tags"])
+        )
+
+    def _subtopic_matcher(self, research_topic: ResearchTopic):
+        """
+        Return a callable mapping a finding text to the set of subtopics it
+        mentions, built once per topic and reused for every finding. With
+        pyahocorasick installed, one automaton pass tags all subtopics in time
+        linear in the text length; otherwise a compiled regex alternation keeps
+        the scan at one C-level pass instead of a substring test per subtopic.
+        """
+        cached = self._subtopic_patterns.get(research_topic.id)
+        if cached is not None:
+            return cached
+
+        subtopics = [s for s in research_topic.subtopics if s]
+        if not subtopics:
+            matcher = lambda text: set()
+        elif ahocorasick:
+            automaton = ahocorasick.Automaton()
+            for subtopic in subtopics:
+                automaton.add_word(subtopic.lower(), subtopic)
+            automaton.make_automaton()
+            matcher = lambda text: {s for _, s in automaton.iter(text.lower())}
+        else:
+            # Longest-first so overlapping subtopics match the most specific one
+            pattern = re.compile(
+                "|".join(map(re.escape, sorted(subtopics, key=len, reverse=True))),
+                re.IGNORECASE
+            )
+            subtopic_map = {s.lower(): s for s in subtopics}
+            matcher = lambda text: {subtopic_map[m.lower()] for m in pattern.findall(text)}
+
+        self._subtopic_patterns[research_topic.id] = matcher
+        return matcher
+
+    def _register_document(self, document: ResearchDocument) -> bool:
+        """
+        Store a document unless it duplicates one already retrieved (same URL or
+        near-identical content). Returns True if the document is new.
+        """
+        if document.url and document.url in self._seen_urls:
+            return False
+        for existing in self._seen_doc_shingles:
+            if _jaccard(document.shingles, existing) >= DOC_DUP_JACCARD:
+                return False
+        if document.url:
+            self._seen_urls.add(document.url)
+        self._seen_doc_shingles.append(document.shingles)
+        self.documents[document.id] = document
+        return True
+
+    def _dedup_findings(self, findings: List[ResearchFinding]) -> List[ResearchFinding]:
+        """Merge near-duplicate findings, combining their source document lists."""
+        unique = []
+        kept_shingles = []
+        for finding in findings:
+            shingles = _shingles(finding.content)
+            merged = False
+            for idx, (kept, kept_sh) in enumerate(zip(unique, kept_shingles)):
+                if _jaccard(shingles, kept_sh) >= FINDING_DUP_JACCARD:
+                    extra = tuple(doc_id for doc_id in finding.source_documents
+                                  if doc_id not in kept.source_documents)
+                    if extra:
+                        # Findings are frozen, so merging sources means a new copy
+                        kept = replace(kept, source_documents=kept.source_documents + extra)
+                        unique[idx] = kept
+                        self.findings[kept.id] = kept
+                    self.findings.pop(finding.id, None)
+                    merged = True
+                    break
+            if not merged:
+                unique.append(finding)
+                kept_shingles.append(shingles)
+        return unique
+
+    def _cache_key(self, kwargs: Dict[str, Any]) -> str:
+        """Compute a stable cache key for a messages.create request."""
+        payload = json.dumps({"schema": CACHE_SCHEMA, **kwargs}, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _response_text(response) -> str:
+        """
+        Return the first text block of a response. Index 0 is not guaranteed to
+        be text (tool-use blocks can precede it), and a blind content[0].text
+        on such a response would waste the whole call on a silent fallback.
+        """
+        return next(
+            (block.text for block in response.content
+             if getattr(block, "type", None) == "text"),
+            ""
+        )
+
+    @staticmethod
+    def _estimate_max_tokens(finding_count: int, source_count: int = 0) -> int:
+        """
+        Scale a call's generation window to the payload size instead of paying
+        a flat 3-4K cap: the API schedules and bills by max_tokens, so an
+        oversized window inflates both latency and cost.
+        """
+        return min(4096, 400 + 60 * finding_count + 40 * source_count)
+
+    @staticmethod
+    def _estimate_synthesis_max_tokens(finding_count: int, subtopic_count: int) -> int:
+        """
+        Window for the synthesis call, which writes a paragraph per subtopic
+        plus an overall narrative rather than one line per finding. Keep a
+        high floor: a truncated tool payload fails JSON parsing and silently
+        degrades the whole run to the default synthesis.
+        """
+        return min(4096, 1500 + 40 * finding_count + 250 * subtopic_count)
+
+    @staticmethod
+    def _estimate_format_max_tokens(finding_count: int, source_count: int) -> int:
+        """
+        Window for the report-formatting call, which writes nine prose
+        sections plus one bibliography entry per source. Same floor rationale
+        as the synthesis window: a clipped payload fails JSON parsing and
+        every section degrades to a placeholder.
+        """
+        return min(4096, 2000 + 60 * finding_count + 60 * source_count)
+
+    @staticmethod
+    def _log_usage(response) -> None:
+        """Print the token usage of a completed call for cost visibility."""
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            logger.info("Tokens: %d in / %d out", usage.input_tokens, usage.output_tokens)
+
+    def _cached_messages_create(self, **kwargs) -> str:
+        """Call messages.create, caching the response text by request hash."""
+        key = self._cache_key(kwargs)
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return cached
+        response = self.client.messages.create(**kwargs)
+        self._log_usage(response)
+        response_content = self._response_text(response)
+        self._llm_cache.set(key, response_content)
+        return response_content
+
+    async def _asubmit_messages_create(self, **kwargs):
+        """
+        messages.create through the async client, gated by the shared
+        rate limiter and retried with exponential backoff on rate-limit and
+        server errors.
+        """
+        estimated_tokens = (_estimate_tokens(json.dumps(kwargs.get("messages", []), default=str))
+                            + kwargs.get("max_tokens", 0))
+        for attempt in range(RETRY_MAX_ATTEMPTS):
+            await self._rate_limiter.acquire(estimated_tokens)
+            try:
+                return await self.aclient.messages.create(**kwargs)
+            except (anthropic.RateLimitError, anthropic.InternalServerError) as e:
+                if attempt == RETRY_MAX_ATTEMPTS - 1:
+                    # Out of retries: surface the final attempt's error
+                    raise
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("retry-after") if response is not None else None
+                delay = float(retry_after) if retry_after else RETRY_BASE_DELAY * 2 ** attempt
+                logger.warning("API overloaded (attempt %d/%d); retrying in %.1fs",
+                               attempt + 1, RETRY_MAX_ATTEMPTS, delay)
+                await asyncio.sleep(delay)
+
+    async def _acached_messages_create(self, **kwargs) -> str:
+        """Async variant of _cached_messages_create."""
+        key = self._cache_key(kwargs)
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self._asubmit_messages_create(**kwargs)
+        self._log_usage(response)
+        response_content = self._response_text(response)
+        self._llm_cache.set(key, response_content)
+        return response_content
+
+    def _cached_messages_stream(self, **kwargs) -> str:
+        """
+        Streaming variant of _cached_messages_create: consume text chunks as
+        they arrive instead of blocking until the full max_tokens window is
+        generated, so large responses start flowing immediately.
+        """
+        key = self._cache_key(kwargs)
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return cached
+        chunks = []
+        tracker = _JsonStreamTracker()
+        with self.client.messages.stream(**kwargs) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+                print(".", end="", flush=True)
+                if tracker.feed(text):
+                    # The JSON object is complete; anything further is fence
+                    # or prose, so stop generating it
+                    break
+        print()
+        response_content = "".join(chunks)
+        self._llm_cache.set(key, response_content)
+        return response_content
+
+    @staticmethod
+    def _structured_tools(tool_name: str, input_schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the tools/tool_choice kwargs that force a structured response."""
+        return {
+            "tools": [{
+                "name": tool_name,
+                "description": "Record the structured result of this analysis step.",
+                "input_schema": input_schema
+            }],
+            "tool_choice": {"type": "tool", "name": tool_name}
+        }
+
+    @staticmethod
+    def _cached_system(text: str) -> List[Dict[str, Any]]:
+        """
+        System prompt in array form with the text marked for Anthropic prompt
+        caching, so repeat calls serve the prefix from cache instead of
+        re-prefilling it.
+        """
+        return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+    @staticmethod
+    def _cached_content(static_text: str, variable_text: str) -> List[Dict[str, Any]]:
+        """
+        User content split into a cache-marked static instruction block
+        followed by the per-call data. The static prefix must come first:
+        prompt caching matches everything up to the marked block.
+        """
+        return [
+            {"type": "text", "text": static_text, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": variable_text}
+        ]
+
+    def _tool_input(self, response) -> Dict[str, Any]:
+        """Read the tool-use payload from a response, falling back to text parsing."""
+        for block in response.content:
+            if getattr(block, "type", None) == "tool_use":
+                return block.input
+        text = self._response_text(response)
+        return self._extract_json(text) if text else {}
+
+    def _structured_messages_create(self, tool_name: str, input_schema: Dict[str, Any],
+                                    **kwargs) -> Dict[str, Any]:
+        """Call messages.create with forced tool use and return the payload dict."""
+        key = self._cache_key({"tool": tool_name, **kwargs})
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return _json_loads(cached)
+        response = self.client.messages.create(
+            **self._structured_tools(tool_name, input_schema), **kwargs
+        )
+        self._log_usage(response)
+        result = self._tool_input(response)
+        self._llm_cache.set(key, _json_dumps(result))
+        return result
+
+    async def _astructured_messages_create(self, tool_name: str, input_schema: Dict[str, Any],
+                                           **kwargs) -> Dict[str, Any]:
+        """Async variant of _structured_messages_create."""
+        key = self._cache_key({"tool": tool_name, **kwargs})
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return _json_loads(cached)
+        response = await self._asubmit_messages_create(
+            **self._structured_tools(tool_name, input_schema), **kwargs
+        )
+        self._log_usage(response)
+        result = self._tool_input(response)
+        self._llm_cache.set(key, _json_dumps(result))
+        return result
+
+    def _run_message_batch(self, requests_by_id: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Submit several independent messages.create payloads as one Message
+        Batches job and return the resulting Message objects keyed by
+        custom_id. Batched requests are half price and generated server-side
+        in parallel. Raises if the batch stalls or any request fails, so
+        callers can fall back to sequential calls.
+        """
+        batch = self.client.messages.batches.create(requests=[
+            {"custom_id": custom_id, "params": params}
+            for custom_id, params in requests_by_id.items()
+        ])
+        deadline = time.time() + BATCH_TIMEOUT
+        while self.client.messages.batches.retrieve(batch.id).processing_status != "ended":
+            if time.time() > deadline:
+                raise TimeoutError(f"Message batch {batch.id} did not finish "
+                                   f"within {BATCH_TIMEOUT:.0f}s")
+            time.sleep(BATCH_POLL_INTERVAL)
+
+        messages = {}
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.result.type != "succeeded":
+                raise RuntimeError(f"Batch request {entry.custom_id}: {entry.result.type}")
+            self._log_usage(entry.result.message)
+            messages[entry.custom_id] = entry.result.message
+        return messages
+
+    def conduct_research(self, query: str, depth: str = "comprehensive",
                          time_limit: int = None) -> Dict[str, Any]:
         """
         Main entry point for conducting research on a given query.
@@ -82,37 +1146,45 @@ class DeepResearchAgent:
         """
         try:
             start_time = time.time()
-            
+
+            # The dedup indexes exist to skip duplicate extraction calls
+            # within a run; scope them per run so a repeat query doesn't
+            # reject its own documents as duplicates of the previous run's.
+            # Repeat extractions across runs are already absorbed by the
+            # response cache, so resetting costs nothing but cache lookups.
+            self._seen_urls = set()
+            self._seen_doc_shingles = []
+
             # 1. Create a research plan
-            print("Creating research plan...")
+            logger.info("Creating research plan...")
             research_topic = self._create_research_plan(query, depth)
             
-            # 2. Retrieve relevant documents
-            print("Retrieving documents...")
-            retrieved_docs = self._retrieve_documents(research_topic)
-            
-            # 3. Extract key information from documents
-            print("Extracting information...")
-            findings = self._extract_information(retrieved_docs, research_topic)
+            # 2 + 3. Retrieve documents and extract key information as a pipeline:
+            # extraction on each document starts as soon as it arrives, while the
+            # retriever is still fetching the rest
+            logger.info("Retrieving documents and extracting information...")
+            retrieved_docs, findings = asyncio.run(
+                self._run_in_loop(self._retrieve_and_extract(research_topic))
+            )
             
             # 4. Synthesize information
-            print("Synthesizing findings...")
+            logger.info("Synthesizing findings...")
             synthesis = self._synthesize_findings(findings, research_topic)
             
-            # 5. Generate insights and identify gaps
-            print("Generating insights...")
-            enhanced_synthesis = self._generate_insights(synthesis, research_topic)
-            
-            # 6. Format and finalize the research output
-            print("Formatting research output...")
-            final_output = self._format_research_output(enhanced_synthesis)
+            # 5 + 6. Insights and formatting are independent LLM calls, so they
+            # go out as one Message Batches job (half price, generated server-
+            # side in parallel), falling back to sequential calls on failure
+            logger.info("Generating insights and formatting research output...")
+            final_output = self._insights_and_format(synthesis, research_topic)
             
             research_time = time.time() - start_time
-            print(f"Research completed in {research_time:.2f} seconds")
-            
+            logger.info("Research completed in %.2f seconds", research_time)
+            logger.info("LLM cache: %d hits, %d misses",
+                        self._llm_cache.stats["hits"], self._llm_cache.stats["misses"])
+
             return final_output
         except Exception as e:
-            print(f"Error during research: {str(e)}")
+            logger.exception("Error during research")
             raise
         
     def _create_research_plan(self, query: str, depth: str) -> ResearchTopic:
@@ -120,47 +1192,42 @@ class DeepResearchAgent:
         Use Claude 3.7 to create a detailed research plan for the query.
         """
         try:
-            planning_prompt = f"""
-            Create a detailed research plan for the following query:
-            
-            QUERY: {query}
-            DEPTH: {depth}
-            
-            Your task is to:
-            1. Break down this research question into clear subtopics
-            2. Identify key search terms and keywords for each subtopic
-            3. Define the scope of research (time period, domains, etc.)
-            4. Identify potential sources of information
-            5. Suggest a structured approach to investigate this topic
-            
-            Format your response as a valid JSON object with the following structure:
-            {{
-                "main_query": "The main research question",
-                "subtopics": ["subtopic1", "subtopic2", ...],
-                "keywords": ["keyword1", "keyword2", ...],
-                "scope": {{
-                    "time_range": ["start_year", "end_year"],
-                    "domains": ["domain1", "domain2", ...],
-                    "excluded_areas": ["area1", "area2", ...]
-                }},
-                "potential_sources": ["source1", "source2", ...],
-                "research_approach": "Description of the approach"
-            }}
-            """
-            
-            response = self.client.messages.create(
-                model="claude-3-7-sonnet-20250219",
-                max_tokens=2000,
-                system="You are a research planning assistant that creates comprehensive research plans.",
-                messages=[{"role": "user", "content": planning_prompt}]
-            )
-            
-            # Extract the content from the response
-            response_content = response.content[0].text
-            
-            # Extract JSON from the response
-            plan_json = self._extract_json(response_content)
-            
+            # Plans for near-duplicate queries ("impacts of X" vs "effects of X")
+            # come out almost identical; adapting a cached plan with a short call
+            # is much cheaper than planning from scratch
+            similar = self._find_similar_plan(query)
+            # Guard against degenerate entries persisted by earlier versions
+            if similar is not None and not self._plan_usable(similar[1]):
+                similar = None
+            if similar is not None and similar[2] >= 1.0:
+                # Same word set as a cached query: the plan applies as-is, so
+                # skip the LLM entirely rather than paying an adaptation call
+                logger.info("Reusing cached plan from query %r", similar[0])
+                plan_json = similar[1]
+            else:
+                if similar is not None:
+                    cached_query, cached_plan, _ = similar
+                    planning_prompt = _PLAN_ADAPT_TMPL.substitute(
+                        cached_query=cached_query,
+                        query=query,
+                        depth=depth,
+                        plan=_json_dumps(cached_plan)
+                    )
+                    max_tokens = 500
+                else:
+                    planning_prompt = _PLAN_PROMPT_TMPL.substitute(query=query, depth=depth)
+                    max_tokens = 2000
+
+                plan_json = self._structured_messages_create(
+                    "emit_plan", PLAN_SCHEMA,
+                    model="claude-3-7-sonnet-20250219",
+                    max_tokens=max_tokens,
+                    system=self._cached_system("You are a research planning assistant that creates comprehensive research plans."),
+                    messages=[{"role": "user", "content": planning_prompt}]
+                )
+
+                self._remember_plan(query, plan_json)
+
             # Default values in case parsing fails
             default_scope = {
                 "time_range": ["2020", "2023"],
@@ -187,7 +1254,7 @@ class DeepResearchAgent:
             
             return research_topic
         except Exception as e:
-            print(f"Error creating research plan: {str(e)}")
+            logger.exception("Error creating research plan")
             # Create a minimal research topic as fallback
             topic_id = f"topic_{int(time.time())}"
             fallback_topic = ResearchTopic(
@@ -216,78 +1283,213 @@ class DeepResearchAgent:
                 mock_documents = self._generate_mock_documents(research_topic)
                 retrieved_documents.extend(mock_documents)
             
-            # Store documents for later use
-            for doc in retrieved_documents:
-                self.documents[doc.id] = doc
-                
-            return retrieved_documents
+            # Store documents for later use, dropping duplicates
+            return [doc for doc in retrieved_documents if self._register_document(doc)]
         except Exception as e:
-            print(f"Error retrieving documents: {str(e)}")
+            logger.exception("Error retrieving documents")
             # Return empty list as fallback
             return []
-    
+
+    async def _aretrieve_documents(self, research_topic: ResearchTopic):
+        """
+        Retrieve documents as an async generator, yielding each document as soon
+        as its sub-search completes so downstream stages can start on it early.
+        """
+        try:
+            if self.search_api_key:
+                semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+                tasks = [asyncio.ensure_future(self._search_keyword(keyword, semaphore))
+                         for keyword in self._focused_keywords(research_topic)]
+                for task in asyncio.as_completed(tasks):
+                    for result in await task:
+                        document = self._document_from_result(result)
+                        if self._register_document(document):
+                            yield document
+            else:
+                # For demo purposes without an API key, generate mock documents
+                for document in self._generate_mock_documents(research_topic):
+                    if self._register_document(document):
+                        yield document
+        except Exception as e:
+            logger.exception("Error retrieving documents")
+
+    async def _retrieve_and_extract(self, research_topic: ResearchTopic):
+        """
+        Run retrieval and extraction as a producer/consumer pipeline connected by
+        an asyncio.Queue, overlapping the two network-bound stages.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        documents: List[ResearchDocument] = []
+        findings: List[ResearchFinding] = []
+
+        async def producer():
+            async for document in self._aretrieve_documents(research_topic):
+                documents.append(document)
+                await queue.put(document)
+            await queue.put(None)  # Sentinel: retrieval is done
+
+        async def batcher():
+            # Accumulate documents into batches as they arrive and dispatch each
+            # batch extraction as soon as it fills, without waiting for the rest
+            tasks = []
+            batch: List[ResearchDocument] = []
+            batch_tokens = 0
+            while True:
+                document = await queue.get()
+                if document is None:
+                    break
+                doc_tokens = min(document.token_count, DOC_TOKEN_BUDGET)
+                if batch and (len(batch) >= MAX_DOCS_PER_EXTRACTION
+                              or batch_tokens + doc_tokens > EXTRACTION_TOKEN_BUDGET):
+                    tasks.append(asyncio.create_task(
+                        self._extract_from_batch(batch, research_topic, semaphore)
+                    ))
+                    batch = []
+                    batch_tokens = 0
+                batch.append(document)
+                batch_tokens += doc_tokens
+            if batch:
+                tasks.append(asyncio.create_task(
+                    self._extract_from_batch(batch, research_topic, semaphore)
+                ))
+            for batch_findings in await asyncio.gather(*tasks):
+                findings.extend(batch_findings)
+
+        await asyncio.gather(producer(), batcher())
+        findings = self._dedup_findings(findings)
+
+        if documents and not findings:
+            logger.warning("No findings extracted from retrieved documents")
+
+        return documents, findings
+
     def _search_academic_databases(self, research_topic: ResearchTopic) -> List[ResearchDocument]:
         """
         Search academic databases using API calls.
         This is a mock implementation.
         """
         try:
-            documents = []
-            
-            # Using only the first 3 keywords for demo purposes
-            for keyword in research_topic.keywords[:3]:
-                # Use mock data instead of real API calls
-                mock_results = self._mock_api_results(keyword)
-                
-                for result in mock_results:
-                    doc_id = f"doc_{result['id']}"
-                    document = ResearchDocument(
-                        id=doc_id,
-                        title=result["title"],
-                        authors=result["authors"],
-                        publication_date=result["date"],
-                        source=result["journal"],
-                        content=result["abstract"],
-                        abstract=result["abstract"],
-                        url=result["url"],
-                        relevance_score=result["score"]
-                    )
-                    documents.append(document)
-            
-            return documents
+            # Using only the first 3 keywords for demo purposes; the searches are
+            # independent, so run them concurrently instead of one at a time
+            return asyncio.run(
+                self._run_in_loop(self._search_academic_databases_async(research_topic))
+            )
         except Exception as e:
-            print(f"Error searching academic databases: {str(e)}")
+            logger.exception("Error searching academic databases")
             return []
+
+    async def _search_academic_databases_async(self, research_topic: ResearchTopic) -> List[ResearchDocument]:
+        """Run the per-keyword searches concurrently and collect the results."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        keyword_results = await asyncio.gather(
+            *(self._search_keyword(keyword, semaphore) for keyword in self._focused_keywords(research_topic))
+        )
+
+        documents = []
+        for results in keyword_results:
+            for result in results:
+                documents.append(self._document_from_result(result))
+
+        return documents
+
+    async def _search_keyword(self, keyword: str, semaphore: asyncio.Semaphore) -> List[Dict]:
+        """Search a single keyword. A real search API call would be awaited here."""
+        async with semaphore:
+            return self._mock_api_results(keyword)
+
+    def _focused_keywords(self, research_topic: ResearchTopic,
+                          budget: int = KEYWORD_SEARCH_BUDGET) -> List[str]:
+        """
+        Score each keyword against the query and subtopics and keep the most
+        relevant ones up to the budget. Overlap with the query confirms focus
+        but cannot refute it: the planner deliberately emits related terms
+        that share no words with the query (e.g. "qubit decoherence" for a
+        quantum-computing query), so low overlap on a multi-word keyword
+        means unknown, not unfocused -- only generic single-word strays are
+        dropped.
+        """
+        reference = set(re.findall(r"\w+", research_topic.query.lower()))
+        for subtopic in research_topic.subtopics:
+            reference.update(re.findall(r"\w+", subtopic.lower()))
+
+        scored = []
+        for keyword in research_topic.keywords:
+            words = set(re.findall(r"\w+", keyword.lower()))
+            score = len(words & reference) / len(words) if words else 0.0
+            if score < KEYWORD_RELEVANCE_THRESHOLD and len(words) <= 1:
+                logger.info("Skipping unfocused keyword %r (relevance %.2f)", keyword, score)
+                continue
+            scored.append((score, keyword))
+
+        if not scored:
+            # Retrieval with no keywords finds nothing; fall back to the
+            # planner's ordering rather than returning an empty list
+            return research_topic.keywords[:budget]
+        scored.sort(key=lambda pair: pair[0], reverse=True)
+        return [keyword for _, keyword in scored[:budget]]
+
+    def _document_from_result(self, result: Dict) -> ResearchDocument:
+        """Build a ResearchDocument from a raw search API result."""
+        return ResearchDocument(
+            id=f"doc_{result['id']}",
+            title=result["title"],
+            authors=result["authors"],
+            publication_date=result["date"],
+            source=result["journal"],
+            content=result["abstract"],
+            abstract=result["abstract"],
+            url=result["url"],
+            relevance_score=result["score"]
+        )
     
     # Update the mock data generator to use more recent dates
-    def _mock_api_results(self, keyword: str) -> List[Dict]:
-        """Generate mock API results with more recent dates."""
-        import random
-        
-        journals = ["Nature", "Science", "PNAS", "Cell", "The Lancet"]
-        
-        results = []
-        for i in range(3):  # Generate 3 mock results per keyword
-            results.append({
-                "id": f"{int(time.time())}{i}",
-                "title": f"Research on {keyword.title()}: Advances and Implications",
+    def _mock_api_results(self, keyword: str, n: int = 3) -> List[Dict]:
+        """Generate n mock API results with more recent dates."""
+        if _RNG is not None:
+            # Vectorized: one generator call per field instead of n Python-level
+            # random calls per result
+            years = _RNG.integers(3, 5, n)  # 2023-2024 dates
+            months = _RNG.integers(1, 13, n)
+            scores = _RNG.uniform(0.7, 0.99, n)
+            journals = _RNG.choice(_JOURNALS, n)
+        else:
+            years = random.choices((3, 4), k=n)
+            months = random.choices(range(1, 13), k=n)
+            scores = [random.uniform(0.7, 0.99) for _ in range(n)]
+            journals = random.choices(_JOURNALS, k=n)
+
+        # The per-result fields below only vary by index, so build the constant
+        # parts once outside the loop
+        stamp = int(time.time())
+        title = f"Research on {keyword.title()}: Advances and Implications"
+        abstract = (f"This paper investigates the latest developments in {keyword} from 2023-2024. "
+                    f"We found significant results related to {keyword} that have "
+                    f"implications for future research and applications.")
+        url_base = f"https://example.com/papers/{keyword.replace(' ', '_')}"
+
+        return [
+            {
+                "id": f"{stamp}{i}",
+                "title": title,
                 "authors": ["J. Smith", "A. Johnson", "M. Williams"],
-                "date": f"202{random.randint(3, 4)}-{random.randint(1, 12):02d}",  # 2023-2024 dates
-                "journal": random.choice(journals),
-                "abstract": f"This paper investigates the latest developments in {keyword} from 2023-2024. "
-                        f"We found significant results related to {keyword} that have "
-                        f"implications for future research and applications.",
-                "url": f"https://example.com/papers/{keyword.replace(' ', '_')}{i}",
-                "score": random.uniform(0.7, 0.99)
-            })
-        
-        return results
+                "date": f"202{years[i]}-{months[i]:02d}",
+                "journal": str(journals[i]),
+                "abstract": abstract,
+                "url": f"{url_base}{i}",
+                "score": float(scores[i])
+            }
+            for i in range(n)
+        ]
     
     def _generate_mock_documents(self, research_topic: ResearchTopic) -> List[ResearchDocument]:
         """Generate mock documents for demonstration purposes."""
         try:
             documents = []
-            
+
+            # Loop invariants: the time range never changes per document
+            time_range = research_topic.scope.get('time_range', ['2020', '2023'])
+
             # Generate 1-2 documents for each subtopic
             for i, subtopic in enumerate(research_topic.subtopics):
                 for j in range(2):
@@ -301,43 +1503,17 @@ class DeepResearchAgent:
                     keyword = research_topic.keywords[keyword_idx] if research_topic.keywords else subtopic
                     keyword2 = research_topic.keywords[keyword_idx2] if research_topic.keywords else subtopic
                     keyword3 = research_topic.keywords[keyword_idx3] if research_topic.keywords else subtopic
-                    
-                    # Safely access time range
-                    time_range = research_topic.scope.get('time_range', ['2020', '2023'])
-                    
-                    # Create more realistic mock content
-                    content = f"""
-                    Abstract:
-                    This research explores {subtopic} in detail, with a focus on recent developments.
-                    We analyze the implications of {keyword} on various aspects of {subtopic}.
-                    
-                    Introduction:
-                    The field of {subtopic} has seen significant advancement in recent years.
-                    This paper aims to provide a comprehensive overview of the current state of research
-                    and identify future directions. We begin by examining the fundamental concepts
-                    related to {keyword}.
-                    
-                    Methodology:
-                    Our research methodology involved a systematic review of literature published
-                    between {time_range[0]} and {time_range[1]}.
-                    We analyzed over 50 papers from leading journals in the field.
-                    
-                    Findings:
-                    Our analysis revealed several key patterns. First, {subtopic} is increasingly
-                    recognized as critical in understanding {research_topic.query}.
-                    Second, the connection between {subtopic} and {keyword2}
-                    appears stronger than previously thought.
-                    
-                    Discussion:
-                    These findings suggest that future research should focus on exploring the
-                    relationship between {subtopic} and {keyword3}.
-                    There are still significant gaps in our understanding of how {subtopic}
-                    affects practical applications in real-world scenarios.
-                    
-                    Conclusion:
-                    This research contributes to the growing body of knowledge on {research_topic.query}
-                    and highlights the importance of {subtopic} in this context.
-                    """
+
+                    # Fill the preparsed template instead of rebuilding an f-string
+                    content = _MOCK_DOC_TMPL.substitute(
+                        subtopic=subtopic,
+                        keyword=keyword,
+                        keyword2=keyword2,
+                        keyword3=keyword3,
+                        t0=time_range[0],
+                        t1=time_range[1],
+                        query=research_topic.query
+                    )
                     
                     # Create the document
                     document = ResearchDocument(
@@ -356,7 +1532,7 @@ class DeepResearchAgent:
             
             return documents
         except Exception as e:
-            print(f"Error generating mock documents: {str(e)}")
+            logger.exception("Error generating mock documents")
             # Create a single fallback document
             fallback_id = f"doc_fallback_{int(time.time())}"
             fallback_doc = ResearchDocument(
@@ -376,189 +1552,196 @@ class DeepResearchAgent:
         Use Claude 3.7 to extract key information and findings from documents.
         """
         try:
-            findings = []
-            
             if not documents:
-                print("Warning: No documents to extract information from")
+                logger.warning("No documents to extract information from")
                 return []
-            
-            # Process each document to extract key findings
-            for document in documents:
-                extraction_prompt = f"""
-                Extract key information and findings from the following research document.
-                
-                DOCUMENT TITLE: {document.title}
-                AUTHORS: {', '.join(document.authors)}
-                PUBLICATION: {document.source} ({document.publication_date})
-                
-                CONTENT:
-                {document.content[:8000]}  # Limit content length
-                
-                RESEARCH QUESTION:
-                {research_topic.query}
-                
-                RELEVANT SUBTOPICS:
-                {', '.join(research_topic.subtopics)}
-                
-                Extract the following:
-                1. Key findings or claims made in the document
-                2. Evidence provided to support these findings
-                3. Methodologies used
-                4. Limitations mentioned
-                5. How the findings relate to our research question
-                
-                Format your response as a valid JSON object with the following structure:
-                {{
-                    "key_findings": [
-                        {{
-                            "finding": "Description of finding",
-                            "evidence": "Evidence provided",
-                            "relevance": "Relevance to research question",
-                            "confidence": 0.95  # Value between 0-1 representing confidence in the extraction
-                        }},
-                        ...
-                    ],
-                    "methodologies": ["methodology1", "methodology2", ...],
-                    "limitations": ["limitation1", "limitation2", ...],
-                    "research_gaps": ["gap1", "gap2", ...]
-                }}
-                """
-                
-                response = self.client.messages.create(
-                    model="claude-3-7-sonnet-20250219",
-                    max_tokens=2500,
-                    system="You are a research analysis assistant that extracts key information from academic papers.",
-                    messages=[{"role": "user", "content": extraction_prompt}]
-                )
-                
-                # Extract the content from the response
-                response_content = response.content[0].text
-                
-                # Extract the JSON from the response
-                findings_json = self._extract_json(response_content)
-                
-                # Default if key_findings is missing
-                key_findings = findings_json.get("key_findings", [])
-                if not key_findings:
-                    key_findings = [{
-                        "finding": f"The document discusses {research_topic.query}.",
-                        "evidence": "Not specified",
-                        "relevance": "Directly related to the research question",
-                        "confidence": 0.7
-                    }]
-                
-                # Create ResearchFinding objects for each key finding
-                for i, finding_data in enumerate(key_findings):
-                    finding_id = f"finding_{document.id}_{i}"
-                    finding = ResearchFinding(
-                        id=finding_id,
-                        content=finding_data.get("finding", "No finding specified"),
-                        source_documents=[document.id],
-                        confidence=finding_data.get("confidence", 0.7),
-                        tags=[research_topic.query] + [st for st in research_topic.subtopics 
-                                                     if st.lower() in finding_data.get("finding", "").lower()]
-                    )
-                    findings.append(finding)
-                    self.findings[finding_id] = finding
-                    
-            return findings
+
+            # The per-document extractions are independent network-bound calls,
+            # so run them concurrently: total latency becomes roughly the slowest
+            # single call instead of the sum of all of them
+            return asyncio.run(
+                self._run_in_loop(self._extract_information_async(documents, research_topic))
+            )
         except Exception as e:
-            print(f"Error extracting information: {str(e)}")
+            logger.exception("Error extracting information")
             # Create a fallback finding
             fallback_id = f"finding_fallback_{int(time.time())}"
             fallback_finding = ResearchFinding(
                 id=fallback_id,
                 content=f"General information about {research_topic.query}",
-                source_documents=[doc.id for doc in documents[:1]] if documents else [],
+                source_documents=(documents[0].id,) if documents else (),
                 confidence=0.5,
-                tags=[research_topic.query]
+                tags=(research_topic.query,)
             )
             return [fallback_finding]
-    
-    def _synthesize_findings(self, findings: List[ResearchFinding], 
+
+    async def _extract_information_async(self, documents: List[ResearchDocument],
+                                         research_topic: ResearchTopic) -> List[ResearchFinding]:
+        """Extract findings from all documents, batched to amortize prompt overhead."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        per_batch_findings = await asyncio.gather(
+            *(self._extract_from_batch(batch, research_topic, semaphore)
+              for batch in self._batch_documents(documents))
+        )
+
+        findings = []
+        for batch_findings in per_batch_findings:
+            findings.extend(batch_findings)
+
+        return self._dedup_findings(findings)
+
+    def _batch_documents(self, documents: List[ResearchDocument]) -> List[List[ResearchDocument]]:
+        """
+        Greedily group documents into batches so each extraction call amortizes
+        the fixed prompt overhead (system message, research question, subtopics)
+        across several documents.
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for document in documents:
+            doc_tokens = min(document.token_count, DOC_TOKEN_BUDGET)
+            if batch and (len(batch) >= MAX_DOCS_PER_EXTRACTION
+                          or batch_tokens + doc_tokens > EXTRACTION_TOKEN_BUDGET):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(document)
+            batch_tokens += doc_tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _extract_from_batch(self, documents: List[ResearchDocument],
+                                  research_topic: ResearchTopic,
+                                  semaphore: asyncio.Semaphore) -> List[ResearchFinding]:
+        """Extract key findings from a batch of documents with a single LLM call."""
+        try:
+            document_sections = "\n".join(
+                f"### DOC {i}\n"
+                f"DOCUMENT TITLE: {document.title}\n"
+                f"AUTHORS: {', '.join(document.authors)}\n"
+                f"PUBLICATION: {document.source} ({document.publication_date})\n"
+                f"CONTENT:\n{document.snippet}\n"
+                for i, document in enumerate(documents)
+            )
+
+            extraction_prompt = _EXTRACTION_PROMPT_TMPL.substitute(
+                document_sections=document_sections,
+                query=research_topic.query,
+                subtopics=", ".join(research_topic.subtopics)
+            )
+
+            async with semaphore:
+                batch_json = await self._astructured_messages_create(
+                    "emit_findings", BATCH_EXTRACTION_SCHEMA,
+                    model="claude-3-7-sonnet-20250219",
+                    max_tokens=min(8000, 1000 + 1500 * len(documents)),
+                    system=self._cached_system("You are a research analysis assistant that extracts key information from academic papers."),
+                    messages=[{"role": "user", "content": extraction_prompt}]
+                )
+
+            # Map each extraction back to its document by doc_index
+            by_index = {}
+            for extraction in batch_json.get("extractions", []):
+                doc_index = extraction.get("doc_index")
+                if isinstance(doc_index, int) and 0 <= doc_index < len(documents):
+                    by_index[doc_index] = extraction
+
+            findings = []
+            for i, document in enumerate(documents):
+                findings.extend(
+                    self._findings_from_json(by_index.get(i, {}), document, research_topic)
+                )
+
+            return findings
+        except Exception as e:
+            logger.exception("Error extracting from document batch")
+            return []
+
+    def _findings_from_json(self, findings_json: Dict[str, Any],
+                            document: ResearchDocument,
+                            research_topic: ResearchTopic) -> List[ResearchFinding]:
+        """Build ResearchFinding objects from one document's extraction payload."""
+        # Default if key_findings is missing
+        key_findings = findings_json.get("key_findings", [])
+        if not key_findings:
+            key_findings = [{
+                "finding": f"The document discusses {research_topic.query}.",
+                "evidence": "Not specified",
+                "relevance": "Directly related to the research question",
+                "confidence": 0.7
+            }]
+
+        match_subtopics = self._subtopic_matcher(research_topic)
+
+        # Create ResearchFinding objects for each key finding
+        findings = []
+        for i, finding_data in enumerate(key_findings):
+            finding_id = f"finding_{document.id}_{i}"
+            finding_text = finding_data.get("finding", "No finding specified")
+            matched = match_subtopics(finding_text)
+            finding = ResearchFinding(
+                id=finding_id,
+                content=finding_text,
+                source_documents=(document.id,),
+                confidence=finding_data.get("confidence", 0.7),
+                tags=(research_topic.query,
+                      *(st for st in research_topic.subtopics if st in matched))
+            )
+            findings.append(finding)
+            self.findings[finding_id] = finding
+
+        return findings
+
+    def _synthesize_findings(self, findings: List[ResearchFinding],
                             research_topic: ResearchTopic) -> ResearchSynthesis:
         """
         Use Claude 3.7 to synthesize findings into a coherent narrative.
         """
         try:
             if not findings:
-                print("Warning: No findings to synthesize")
+                logger.warning("No findings to synthesize")
                 return self._create_default_synthesis(research_topic)
             
-            # Prepare findings data for Claude
-            findings_data = []
-            for finding in findings:
-                if not finding.source_documents:
-                    continue
-                    
-                doc_id = finding.source_documents[0]
-                if doc_id not in self.documents:
-                    continue
-                    
-                document = self.documents[doc_id]
-                findings_data.append({
+            # Prepare findings data for Claude: pair each finding with its
+            # source document in one pass, then build the rows with a single
+            # comprehension instead of lookup-and-branch per iteration
+            valid = [(finding, self.documents.get(finding.source_documents[0]))
+                     for finding in findings if finding.source_documents]
+            valid = [(finding, document) for finding, document in valid
+                     if document is not None]
+            findings_data = [
+                {
                     "finding": finding.content,
                     "source": document.title,
                     "authors": ", ".join(document.authors),
                     "publication_date": document.publication_date,
                     "confidence": finding.confidence
-                })
-            
+                }
+                for finding, document in valid
+            ]
+
             if not findings_data:
-                print("Warning: No valid findings data for synthesis")
+                logger.warning("No valid findings data for synthesis")
                 return self._create_default_synthesis(research_topic)
             
-            synthesis_prompt = f"""
-            Synthesize the following research findings into a coherent narrative.
-            
-            RESEARCH QUESTION:
-            {research_topic.query}
-            
-            SUBTOPICS:
-            {', '.join(research_topic.subtopics)}
-            
-            FINDINGS:
-            {json.dumps(findings_data, indent=2)}
-            
-            Your task is to:
-            1. Create a comprehensive synthesis of these findings
-            2. Identify patterns, trends, and connections across findings
-            3. Note contradictions or inconsistencies between findings
-            4. Identify gaps in the research
-            5. Suggest potential directions for future research
-            
-            Format your response as a valid JSON object with the following structure:
-            {{
-                "title": "Title for the research synthesis",
-                "executive_summary": "Brief summary of key insights",
-                "synthesis_by_subtopic": [
-                    {{
-                        "subtopic": "Subtopic name",
-                        "synthesis": "Detailed synthesis of findings for this subtopic",
-                        "key_insights": ["insight1", "insight2", ...]
-                    }},
-                    ...
-                ],
-                "cross_cutting_themes": ["theme1", "theme2", ...],
-                "contradictions": ["contradiction1", "contradiction2", ...],
-                "research_gaps": ["gap1", "gap2", ...],
-                "future_directions": ["direction1", "direction2", ...]
-            }}
-            """
-            
-            response = self.client.messages.create(
+            synthesis_prompt = _SYNTHESIS_PROMPT_TMPL.substitute(
+                query=research_topic.query,
+                subtopics=", ".join(research_topic.subtopics),
+                findings=_json_dumps(findings_data)
+            )
+
+            synthesis_json = self._structured_messages_create(
+                "emit_synthesis", SYNTHESIS_SCHEMA,
                 model="claude-3-7-sonnet-20250219",
-                max_tokens=4000,
-                system="You are a research synthesis assistant that integrates findings into coherent narratives.",
+                max_tokens=self._estimate_synthesis_max_tokens(
+                    len(findings), len(research_topic.subtopics)
+                ),
+                system=self._cached_system("You are a research synthesis assistant that integrates findings into coherent narratives."),
                 messages=[{"role": "user", "content": synthesis_prompt}]
             )
-            
-            # Extract the content from the response
-            response_content = response.content[0].text
-            
-            # Extract the JSON from the response
-            synthesis_json = self._extract_json(response_content)
-            
+
             # Default values if keys are missing
             synthesis_by_subtopic = synthesis_json.get("synthesis_by_subtopic", [])
             if not synthesis_by_subtopic and research_topic.subtopics:
@@ -582,9 +1765,9 @@ class DeepResearchAgent:
                         finding = ResearchFinding(
                             id=finding_id,
                             content=insight,
-                            source_documents=document_ids,
+                            source_documents=tuple(document_ids),
                             confidence=0.9,
-                            tags=[subtopic.get("subtopic", "General")]
+                            tags=(subtopic.get("subtopic", "General"),)
                         )
                         key_findings.append(finding)
             
@@ -594,9 +1777,9 @@ class DeepResearchAgent:
                 finding = ResearchFinding(
                     id=finding_id,
                     content=f"General insight about {research_topic.query}.",
-                    source_documents=document_ids,
+                    source_documents=tuple(document_ids),
                     confidence=0.7,
-                    tags=["General"]
+                    tags=("General",)
                 )
                 key_findings.append(finding)
             
@@ -608,13 +1791,14 @@ class DeepResearchAgent:
                 document_coverage=document_ids,
                 gaps_identified=synthesis_json.get("research_gaps", [f"Further research needed on {research_topic.query}."]),
                 future_directions=synthesis_json.get("future_directions", ["Expand the scope of research."]),
-                bibliography=[self._format_citation(self.documents[doc_id]) for doc_id in document_ids if doc_id in self.documents]
+                # document_ids was already filtered against self.documents above
+                bibliography=[self._format_citation(self.documents[doc_id]) for doc_id in document_ids]
             )
             
             self.syntheses[synthesis_id] = synthesis
             return synthesis
         except Exception as e:
-            print(f"Error synthesizing findings: {str(e)}")
+            logger.exception("Error synthesizing findings")
             return self._create_default_synthesis(research_topic)
     
     def _create_default_synthesis(self, research_topic: ResearchTopic) -> ResearchSynthesis:
@@ -624,9 +1808,9 @@ class DeepResearchAgent:
         default_finding = ResearchFinding(
             id=f"default_finding_{int(time.time())}",
             content=f"General information about {research_topic.query}.",
-            source_documents=[],
+            source_documents=(),
             confidence=0.5,
-            tags=["General"]
+            tags=("General",)
         )
         
         return ResearchSynthesis(
@@ -640,243 +1824,344 @@ class DeepResearchAgent:
             bibliography=[]
         )
     
-    def _generate_insights(self, synthesis: ResearchSynthesis, 
-                          research_topic: ResearchTopic) -> ResearchSynthesis:
+    def _build_insight_prompt(self, synthesis: ResearchSynthesis,
+                              research_topic: ResearchTopic) -> List[Dict[str, Any]]:
         """
-        Use Claude 3.7 to generate deeper insights and identify patterns.
+        Build the content blocks for the insight-generation call: the fixed
+        instructions form a cacheable prefix ahead of the per-call synthesis.
         """
-        try:
-            # Prepare the synthesis data for Claude
-            synthesis_data = {
-                "title": synthesis.title,
-                "summary": synthesis.summary,
-                "key_findings": [finding.content for finding in synthesis.key_findings],
-                "gaps": synthesis.gaps_identified,
-                "future_directions": synthesis.future_directions
-            }
-            
-            insight_prompt = f"""
-            Analyze this research synthesis to generate deeper insights and identify patterns
-            that may not be immediately obvious.
-            
+        synthesis_data = {
+            "title": synthesis.title,
+            "summary": synthesis.summary,
+            "key_findings": [finding.content for finding in synthesis.key_findings],
+            "gaps": synthesis.gaps_identified,
+            "future_directions": synthesis.future_directions
+        }
+
+        return self._cached_content(
+            _INSIGHT_INSTRUCTIONS,
+            f"""
             RESEARCH QUESTION:
             {research_topic.query}
-            
+
             RESEARCH SYNTHESIS:
-            {json.dumps(synthesis_data, indent=2)}
-            
-            Your task is to:
-            1. Identify non-obvious patterns or connections in the research
-            2. Suggest potential paradigm shifts or transformative ideas
-            3. Identify interdisciplinary connections
-            4. Suggest practical applications of the research findings
-            5. Provide a critical perspective on the limitations of current approaches
-            
-            Format your response as a valid JSON object with the following structure:
-            {{
-                "deeper_patterns": ["pattern1", "pattern2", ...],
-                "transformative_ideas": ["idea1", "idea2", ...],
-                "interdisciplinary_connections": ["connection1", "connection2", ...],
-                "practical_applications": ["application1", "application2", ...],
-                "critical_perspective": "Critical perspective on the research",
-                "enhanced_future_directions": ["direction1", "direction2", ...]
-            }}
+            {_json_dumps(synthesis_data)}
             """
-            
-            response = self.client.messages.create(
-                model="claude-3-7-sonnet-20250219",
-                max_tokens=3000,
-                system="You are a research insight generator that identifies deeper patterns and connections.",
-                messages=[{"role": "user", "content": insight_prompt}]
-            )
-            
-            # Extract the content from the response
-            response_content = response.content[0].text
-            
-            # Extract the JSON from the response
-            insights_json = self._extract_json(response_content)
-            
-            # Create a copy of the synthesis to enhance
-            enhanced_synthesis = ResearchSynthesis(
-                id=synthesis.id,
-                title=synthesis.title,
-                summary=synthesis.summary,
-                key_findings=list(synthesis.key_findings),  # Create a new list with the same elements
-                document_coverage=synthesis.document_coverage,
-                gaps_identified=synthesis.gaps_identified,
-                future_directions=insights_json.get("enhanced_future_directions", synthesis.future_directions),
-                bibliography=synthesis.bibliography
+        )
+
+    def _generate_insights(self, synthesis: ResearchSynthesis,
+                          research_topic: ResearchTopic) -> ResearchSynthesis:
+        """
+        Use Claude 3.7 to generate deeper insights and identify patterns.
+        """
+        try:
+            insights_json = self._structured_messages_create(
+                "emit_insights", INSIGHTS_SCHEMA,
+                **self._insight_params(synthesis, research_topic)
             )
-            
-            # Add new findings for the patterns and applications
-            for i, pattern in enumerate(insights_json.get("deeper_patterns", [])):
-                finding_id = f"pattern_finding_{i}"
-                finding = ResearchFinding(
-                    id=finding_id,
-                    content=pattern,
-                    source_documents=synthesis.document_coverage,
-                    confidence=0.85,
-                    tags=["pattern", "insight"]
-                )
-                enhanced_synthesis.key_findings.append(finding)
-                self.findings[finding_id] = finding
-                
-            for i, application in enumerate(insights_json.get("practical_applications", [])):
-                finding_id = f"application_finding_{i}"
-                finding = ResearchFinding(
-                    id=finding_id,
-                    content=application,
-                    source_documents=synthesis.document_coverage,
-                    confidence=0.8,
-                    tags=["application", "insight"]
-                )
-                enhanced_synthesis.key_findings.append(finding)
-                self.findings[finding_id] = finding
-                
-            return enhanced_synthesis
+
+            return self._apply_insights(synthesis, insights_json)
         except Exception as e:
-            print(f"Error generating insights: {str(e)}")
+            logger.exception("Error generating insights")
             # Return the original synthesis if there's an error
             return synthesis
 
+    async def _agenerate_insights(self, synthesis: ResearchSynthesis,
+                                  research_topic: ResearchTopic) -> ResearchSynthesis:
+        """Async variant of _generate_insights."""
+        try:
+            insights_json = await self._astructured_messages_create(
+                "emit_insights", INSIGHTS_SCHEMA,
+                **self._insight_params(synthesis, research_topic)
+            )
+
+            return self._apply_insights(synthesis, insights_json)
+        except Exception as e:
+            logger.exception("Error generating insights")
+            return synthesis
+
+    def _apply_insights(self, synthesis: ResearchSynthesis,
+                        insights_json: Dict[str, Any]) -> ResearchSynthesis:
+        """Fold the insight payload into an enhanced copy of the synthesis."""
+        # Build the pattern and application findings in one shot rather than
+        # appending one at a time
+        new_findings = [
+            ResearchFinding(
+                id=f"pattern_finding_{i}",
+                content=pattern,
+                source_documents=tuple(synthesis.document_coverage),
+                confidence=0.85,
+                tags=("pattern", "insight")
+            )
+            for i, pattern in enumerate(insights_json.get("deeper_patterns", []))
+        ] + [
+            ResearchFinding(
+                id=f"application_finding_{i}",
+                content=application,
+                source_documents=tuple(synthesis.document_coverage),
+                confidence=0.8,
+                tags=("application", "insight")
+            )
+            for i, application in enumerate(insights_json.get("practical_applications", []))
+        ]
+        self.findings.update({finding.id: finding for finding in new_findings})
+
+        return ResearchSynthesis(
+            id=synthesis.id,
+            title=synthesis.title,
+            summary=synthesis.summary,
+            key_findings=[*synthesis.key_findings, *new_findings],
+            document_coverage=synthesis.document_coverage,
+            gaps_identified=synthesis.gaps_identified,
+            future_directions=insights_json.get("enhanced_future_directions", synthesis.future_directions),
+            bibliography=synthesis.bibliography
+        )
+
+    def _insight_params(self, synthesis: ResearchSynthesis,
+                        research_topic: ResearchTopic) -> Dict[str, Any]:
+        """messages.create kwargs for the insight call (without the tool kwargs)."""
+        return {
+            "model": "claude-3-7-sonnet-20250219",
+            "max_tokens": self._estimate_max_tokens(len(synthesis.key_findings)),
+            "system": self._cached_system("You are a research insight generator that identifies deeper patterns and connections."),
+            "messages": [{"role": "user",
+                          "content": self._build_insight_prompt(synthesis, research_topic)}]
+        }
 
-    def _format_research_output(self, synthesis: ResearchSynthesis) -> Dict[str, Any]:
+    def _format_params(self, format_data: Dict[str, Any]) -> Dict[str, Any]:
+        """messages.create kwargs for the report-formatting call."""
+        return {
+            "model": "claude-3-7-sonnet-20250219",
+            "max_tokens": self._estimate_format_max_tokens(len(format_data["key_findings"]),
+                                                           len(format_data["sources"])),
+            "system": self._cached_system("You are a research report assistant that formats research findings into professional reports."),
+            "messages": [{"role": "user",
+                          "content": self._build_format_prompt(format_data)}]
+        }
+
+    def _merge_insight_findings(self, final_output: Dict[str, Any],
+                                synthesis: ResearchSynthesis,
+                                enhanced_synthesis: ResearchSynthesis) -> Dict[str, Any]:
         """
-        Format the final research output for presentation.
+        The formatting call only saw the base synthesis; append the insight-
+        derived findings so the report still covers them.
         """
-        try:
-            # Get all the documents referenced in the synthesis
-            documents = [self.documents[doc_id] for doc_id in synthesis.document_coverage if doc_id in self.documents]
-            
-            # Prepare the data for Claude to format
-            format_data = {
-                "title": synthesis.title,
-                "summary": synthesis.summary,
-                "key_findings": [finding.content for finding in synthesis.key_findings],
-                "future_directions": synthesis.future_directions,
-                "gaps": synthesis.gaps_identified,
-                "sources": [
-                    {
-                        "title": doc.title,
-                        "authors": doc.authors,
-                        "publication": doc.source,
-                        "date": doc.publication_date,
-                        "url": doc.url
-                    }
-                    for doc in documents
-                ]
+        extra_findings = enhanced_synthesis.key_findings[len(synthesis.key_findings):]
+        if extra_findings:
+            bullets = "\n".join(f"- {finding.content}" for finding in extra_findings)
+            final_output["key_findings"] = (
+                f"{final_output['key_findings']}\n\nAdditional insights:\n{bullets}"
+            )
+        return final_output
+
+    async def _insights_and_format_async(self, synthesis: ResearchSynthesis,
+                                         research_topic: ResearchTopic,
+                                         format_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fallback for _insights_and_format: the same two independent calls,
+        issued concurrently through the async client instead of a batch so
+        their network and generation latency still overlap.
+        """
+        enhanced_synthesis, format_text = await asyncio.gather(
+            self._agenerate_insights(synthesis, research_topic),
+            self._acached_messages_create(**self._format_params(format_data))
+        )
+        final_output = self._assemble_report(enhanced_synthesis,
+                                             self._extract_json(format_text))
+        return self._merge_insight_findings(final_output, synthesis, enhanced_synthesis)
+
+    def _insights_and_format(self, synthesis: ResearchSynthesis,
+                             research_topic: ResearchTopic) -> Dict[str, Any]:
+        """
+        Run the insight and formatting calls as one Message Batches job. Both
+        only need the base synthesis, so they are independent; the insight-
+        derived findings are folded into the formatted report afterwards. Any
+        batch failure falls back to concurrent direct calls.
+        """
+        format_data = self._prepare_format_data(synthesis)
+        insight_params = self._insight_params(synthesis, research_topic)
+        format_params = self._format_params(format_data)
+
+        # Same cache keys as the per-call wrappers, so batched and direct
+        # runs share cache entries; only cache misses go into the batch
+        insight_key = self._cache_key({"tool": "emit_insights", **insight_params})
+        format_key = self._cache_key(format_params)
+        insights_cached = self._llm_cache.get(insight_key)
+        format_cached = self._llm_cache.get(format_key)
+
+        pending = {}
+        if insights_cached is None:
+            pending["insights"] = {
+                **self._structured_tools("emit_insights", INSIGHTS_SCHEMA),
+                **insight_params
             }
-            
-            formatting_prompt = f"""
-            Format this research synthesis into a professional research report.
-            
+        if format_cached is None:
+            pending["format"] = format_params
+
+        try:
+            messages = self._run_message_batch(pending) if pending else {}
+        except Exception as e:
+            logger.warning("Message batch failed (%s); falling back to concurrent direct calls", e)
+            messages = None
+
+        # Like every other stage, degrade to synthesis-derived output instead
+        # of letting a formatting failure abort the whole run
+        try:
+            if messages is None:
+                return asyncio.run(
+                    self._run_in_loop(
+                        self._insights_and_format_async(synthesis, research_topic, format_data)
+                    )
+                )
+
+            if "insights" in messages:
+                insights_json = self._tool_input(messages["insights"])
+                self._llm_cache.set(insight_key, _json_dumps(insights_json))
+            else:
+                insights_json = _json_loads(insights_cached)
+            if "format" in messages:
+                format_text = self._response_text(messages["format"])
+                self._llm_cache.set(format_key, format_text)
+            else:
+                format_text = format_cached
+
+            enhanced_synthesis = self._apply_insights(synthesis, insights_json)
+            final_output = self._assemble_report(enhanced_synthesis,
+                                                 self._extract_json(format_text))
+            return self._merge_insight_findings(final_output, synthesis, enhanced_synthesis)
+        except Exception as e:
+            logger.exception("Error generating insights and formatting output")
+            return self._basic_report(synthesis)
+
+    def _prepare_format_data(self, synthesis: ResearchSynthesis) -> Dict[str, Any]:
+        """Assemble the report payload sent to the formatting call."""
+        # Get all the documents referenced in the synthesis; one dict probe
+        # per id instead of a membership test plus a lookup
+        documents = [doc for doc in map(self.documents.get, synthesis.document_coverage)
+                     if doc is not None]
+
+        return {
+            "title": synthesis.title,
+            "summary": synthesis.summary,
+            "key_findings": [finding.content for finding in synthesis.key_findings],
+            "future_directions": synthesis.future_directions,
+            "gaps": synthesis.gaps_identified,
+            "sources": [
+                {
+                    "title": doc.title,
+                    "authors": doc.authors,
+                    "publication": doc.source,
+                    "date": doc.publication_date,
+                    "url": doc.url
+                }
+                for doc in documents
+            ]
+        }
+
+    def _build_format_prompt(self, format_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Build the content blocks for the report-formatting call: the fixed
+        instructions and JSON template form a cacheable prefix ahead of the
+        per-call research data.
+        """
+        return self._cached_content(
+            _FORMAT_INSTRUCTIONS,
+            f"""
             RESEARCH DATA:
-            {json.dumps(format_data, indent=2)}
-            
-            Create a comprehensive research report with the following sections:
-            1. Executive Summary
-            2. Introduction and Background
-            3. Methodology
-            4. Key Findings
-            5. Discussion and Implications
-            6. Research Gaps
-            7. Future Directions
-            8. Conclusion
-            9. Bibliography
-            
-            Format your response as a valid JSON object that contains the complete text
-            for each section of the report:
-            {{
-                "title": "Report title",
-                "executive_summary": "Complete text for executive summary",
-                "introduction": "Complete text for introduction",
-                "methodology": "Complete text for methodology",
-                "key_findings": "Complete text for key findings",
-                "discussion": "Complete text for discussion",
-                "research_gaps": "Complete text for research gaps",
-                "future_directions": "Complete text for future directions",
-                "conclusion": "Complete text for conclusion",
-                "bibliography": ["citation1", "citation2", ...]
-            }}
+            {_json_dumps(format_data)}
             """
-            
-            response = self.client.messages.create(
-                model="claude-3-7-sonnet-20250219",
-                max_tokens=4000,
-                system="You are a research report assistant that formats research findings into professional reports.",
-                messages=[{"role": "user", "content": formatting_prompt}]
-            )
-            
-            # Extract the content from the response
-            response_content = response.content[0].text
-            
+        )
+
+    def _assemble_report(self, synthesis: ResearchSynthesis,
+                         report_json: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge the formatted report payload with synthesis fallbacks and metadata."""
+        defaults = {
+            "title": synthesis.title,
+            "executive_summary": synthesis.summary,
+            "introduction": f"Introduction to {synthesis.title}",
+            "methodology": "Methodology section",
+            "key_findings": "Key findings section",
+            "discussion": "Discussion section",
+            "research_gaps": "Research gaps section",
+            "future_directions": "Future directions section",
+            "conclusion": "Conclusion section",
+            "bibliography": synthesis.bibliography
+        }
+        # One dict merge instead of a .get per section; payload keys outside
+        # the known sections are dropped
+        return {
+            **defaults,
+            **{key: report_json[key] for key in report_json.keys() & defaults.keys()},
+            "metadata": {
+                "research_question": synthesis.title,
+                "document_count": len(synthesis.document_coverage),
+                "finding_count": len(synthesis.key_findings),
+                "generation_date": datetime.now().isoformat(),
+                "research_id": synthesis.id
+            }
+        }
+
+    def _format_research_output(self, synthesis: ResearchSynthesis,
+                                format_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Format the final research output for presentation.
+        """
+        try:
+            if format_data is None:
+                format_data = self._prepare_format_data(synthesis)
+
+            response_content = self._cached_messages_stream(**self._format_params(format_data))
+
             # Extract the JSON from the response
             report_json = self._extract_json(response_content)
-            
-            # Add metadata to the final output
-            final_output = {
-                "title": report_json.get("title", synthesis.title),
-                "executive_summary": report_json.get("executive_summary", synthesis.summary),
-                "introduction": report_json.get("introduction", f"Introduction to {synthesis.title}"),
-                "methodology": report_json.get("methodology", "Methodology section"),
-                "key_findings": report_json.get("key_findings", "Key findings section"),
-                "discussion": report_json.get("discussion", "Discussion section"),
-                "research_gaps": report_json.get("research_gaps", "Research gaps section"),
-                "future_directions": report_json.get("future_directions", "Future directions section"),
-                "conclusion": report_json.get("conclusion", "Conclusion section"),
-                "bibliography": report_json.get("bibliography", synthesis.bibliography),
-                "metadata": {
-                    "research_question": synthesis.title,
-                    "document_count": len(synthesis.document_coverage),
-                    "finding_count": len(synthesis.key_findings),
-                    "generation_date": datetime.now().isoformat(),
-                    "research_id": synthesis.id
-                }
-            }
-            
-            return final_output
+
+            return self._assemble_report(synthesis, report_json)
         except Exception as e:
-            print(f"Error formatting research output: {str(e)}")
-            # Return a basic formatted output with the synthesis data
-            return {
-                "title": synthesis.title,
-                "executive_summary": synthesis.summary,
-                "introduction": f"Introduction to {synthesis.title}",
-                "methodology": "This research was conducted through a systematic review of literature.",
-                "key_findings": "\n".join([f"- {finding.content}" for finding in synthesis.key_findings]),
-                "discussion": "Discussion of the findings and their implications.",
-                "research_gaps": "\n".join([f"- {gap}" for gap in synthesis.gaps_identified]),
-                "future_directions": "\n".join([f"- {direction}" for direction in synthesis.future_directions]),
-                "conclusion": f"In conclusion, this research on {synthesis.title} provides valuable insights.",
-                "bibliography": synthesis.bibliography,
-                "metadata": {
-                    "research_question": synthesis.title,
-                    "document_count": len(synthesis.document_coverage),
-                    "finding_count": len(synthesis.key_findings),
-                    "generation_date": datetime.now().isoformat(),
-                    "research_id": synthesis.id
-                }
+            logger.exception("Error formatting research output")
+            return self._basic_report(synthesis)
+
+    def _basic_report(self, synthesis: ResearchSynthesis) -> Dict[str, Any]:
+        """Basic formatted output built from the synthesis data alone."""
+        return {
+            "title": synthesis.title,
+            "executive_summary": synthesis.summary,
+            "introduction": f"Introduction to {synthesis.title}",
+            "methodology": "This research was conducted through a systematic review of literature.",
+            "key_findings": "\n".join(f"- {finding.content}" for finding in synthesis.key_findings),
+            "discussion": "Discussion of the findings and their implications.",
+            "research_gaps": "\n".join(f"- {gap}" for gap in synthesis.gaps_identified),
+            "future_directions": "\n".join(f"- {direction}" for direction in synthesis.future_directions),
+            "conclusion": f"In conclusion, this research on {synthesis.title} provides valuable insights.",
+            "bibliography": synthesis.bibliography,
+            "metadata": {
+                "research_question": synthesis.title,
+                "document_count": len(synthesis.document_coverage),
+                "finding_count": len(synthesis.key_findings),
+                "generation_date": datetime.now().isoformat(),
+                "research_id": synthesis.id
             }
+        }
     
     def _extract_json(self, text: str) -> Dict[str, Any]:
         """Extract JSON from Claude's response text."""
         try:
-            # Try to find JSON between triple backticks
-            json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-            if json_match:
-                json_str = json_match.group(1)
-                return json.loads(json_str)
-            
-            # If no JSON in backticks, try to find JSON between curly braces
-            json_match = re.search(r'({[\s\S]*})', text)
-            if json_match:
-                json_str = json_match.group(1)
-                return json.loads(json_str)
-                
-            # If still no JSON, try to parse the entire response
-            return json.loads(text)
+            # Fenced responses: the fence brackets exactly the object, so the
+            # precompiled pattern beats guessing at brace positions in prose
+            if "```" in text:
+                fenced = _FENCE_RE.search(text)
+                if fenced:
+                    return _json_loads(fenced.group(1))
+
+            # Bare JSON, possibly surrounded by prose: one balanced scan
+            # instead of guessing from the first and last brace positions
+            candidate = _find_json_object(text)
+            if candidate is not None:
+                return _json_loads(candidate)
+
+            # No object at all: try to parse the entire response
+            return _json_loads(text)
         except Exception as e:
-            print(f"Error extracting JSON: {str(e)}")
+            logger.exception("Error extracting JSON")
             # Fallback: return a simple dictionary
             return {
                 "error": "Failed to parse JSON",
@@ -884,33 +2169,40 @@ class DeepResearchAgent:
             }
     
     def _format_citation(self, document: ResearchDocument) -> str:
-        """Format a document as a citation."""
+        """Format a document as a citation, memoized per document."""
+        cached = self._citation_cache.get(document.id)
+        if cached is not None:
+            return cached
         try:
-            authors = ", ".join(document.authors)
-            return f"{authors}. ({document.publication_date}). {document.title}. {document.source}."
+            citation = (f"{document.authors_str}. ({document.publication_date}). "
+                        f"{document.title}. {document.source}.")
         except Exception as e:
-            print(f"Error formatting citation: {str(e)}")
-            return f"Citation for {document.title}"
+            logger.exception("Error formatting citation")
+            citation = f"Citation for {document.title}"
+        self._citation_cache[document.id] = citation
+        return citation
 
 
 def main():
     """Run the research agent."""
+    logging.basicConfig(level=os.getenv("LOGLEVEL", "INFO"), format="%(message)s")
     try:
         # Get API key from environment variable or use a default for testing
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
-            print("Warning: ANTHROPIC_API_KEY environment variable not set.")
-            print("Using placeholder value for demonstration purposes.")
+            logger.warning("ANTHROPIC_API_KEY environment variable not set; "
+                           "using placeholder value for demonstration purposes")
             api_key = "your-api-key-here"  # This won't work for actual API calls
         
         # Initialize the research agent
         research_agent = DeepResearchAgent(
             api_key=api_key,
-            search_api_key=None  # Using mock data instead
+            search_api_key=None,  # Using mock data instead
+            use_cache="--no-cache" not in sys.argv
         )
         
         # Conduct research on a topic
-        print("Starting research process...")
+        logger.info("Starting research process...")
         research_output = research_agent.conduct_research(
             query="What are the latest advances in quantum computing and their potential impact on AI?",
             depth="standard"
@@ -930,24 +2222,14 @@ def main():
         
         # Save the result to a file
         output_file = "quantum_computing_research.json"
-        with open(output_file, "w") as f:
-            json.dump(research_output, f, indent=2)
+        _write_json(output_file, research_output)
         
-        print(f"\nFull research report saved to {output_file}")
+        logger.info("Full research report saved to %s", output_file)
         
     except Exception as e:
-        print(f"Error in main function: {str(e)}")
+        logger.exception("Error in main function")
 
 
 if __name__ == "__main__":
-    import asyncio
-    try:
-        # For Python 3.7+
-        asyncio.run(main())
-    except AttributeError:
-        # Fallback for older Python versions
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(main())
-    except TypeError:
-        # If main is not async (after removing async/await)
-        main()
\ No newline at end of file
+    # main is sync; conduct_research manages its own event loops internally
+    main()
\ No newline at end of file